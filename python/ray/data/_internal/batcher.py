@@ -117,6 +117,11 @@ class Batcher(BatcherInterface):
             self._buffer = []
             self._buffer_size = 0
             return block
+        first_accessor = BlockAccessor.for_block(self._buffer[0])
+        if first_accessor.num_rows() >= self._batch_size:
+            # Fast path: the batch can be sliced from the first block alone, so
+            # there's no need to build a new block from it.
+            return self._slice_batch_from_first_block(first_accessor, needs_copy)
         output = DelegatingBlockBuilder()
         leftover = []
         needed = self._batch_size
@@ -156,6 +161,27 @@ class Batcher(BatcherInterface):
             batch = batch.slice(0, batch.num_rows(), copy=True)
         return batch
 
+    def _slice_batch_from_first_block(
+        self, accessor: BlockAccessor, needs_copy: bool
+    ) -> Block:
+        num_rows = accessor.num_rows()
+        if num_rows == self._batch_size:
+            self._buffer.pop(0)
+            batch = accessor.to_block()
+            if needs_copy:
+                batch = accessor.slice(0, num_rows, copy=True)
+        else:
+            # Try de-fragmenting table in case its columns have too many chunks
+            # (potentially hindering performance of subsequent slicing operation)
+            if isinstance(accessor, ArrowBlockAccessor):
+                accessor = BlockAccessor.for_block(
+                    transform_pyarrow.try_combine_chunked_columns(accessor.to_block())
+                )
+            batch = accessor.slice(0, self._batch_size, copy=needs_copy)
+            self._buffer[0] = accessor.slice(self._batch_size, num_rows, copy=False)
+        self._buffer_size -= self._batch_size
+        return batch
+
 
 class ShufflingBatcher(BatcherInterface):
     """Chunks blocks into shuffled batches, using a local in-memory shuffle buffer."""
@@ -31,7 +31,7 @@ class Operator:
             out_str += " -> "
         else:
             out_str = ""
-        out_str += f"{self.__class__.__name__}[{self._name}]"
+        out_str += repr(self)
         return out_str
 
     @property
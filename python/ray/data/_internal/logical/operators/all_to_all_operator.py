@@ -133,6 +133,14 @@ class Sort(AbstractAllToAll):
         )
         self._sort_key = sort_key
         self._batch_format = batch_format
+        # Number of leading rows needed from the sorted output, set when a
+        # downstream Limit is pushed down into this operator.
+        self._limit: Optional[int] = None
+
+    def __repr__(self) -> str:
+        if self._limit is None:
+            return super().__repr__()
+        return f"{self.__class__.__name__}[{self._name}, limit={self._limit}]"
 
     def aggregate_output_metadata(self) -> BlockMetadata:
         assert len(self._input_dependencies) == 1, len(self._input_dependencies)
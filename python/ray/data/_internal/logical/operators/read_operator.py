@@ -54,6 +54,11 @@ class Read(AbstractMap):
         """
         return self._cached_output_metadata
 
+    def is_output_metadata_cached(self) -> bool:
+        """Whether :meth:`aggregate_output_metadata` has already been computed, i.e.
+        whether calling it won't call the datasource."""
+        return "_cached_output_metadata" in self.__dict__
+
     @functools.cached_property
     def _cached_output_metadata(self) -> BlockMetadata:
         # Legacy datasources might not implement `get_read_tasks`.
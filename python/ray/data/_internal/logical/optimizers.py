@@ -13,6 +13,11 @@ from ray.data._internal.logical.rules.inherit_batch_format import InheritBatchFo
 from ray.data._internal.logical.rules.inherit_target_max_block_size import (
     InheritTargetMaxBlockSizeRule,
 )
+from ray.data._internal.logical.rules.limit_pushdown import (
+    DropRedundantLimitRule,
+    LimitFusionRule,
+    SortLimitPushdownRule,
+)
 from ray.data._internal.logical.rules.operator_fusion import OperatorFusionRule
 from ray.data._internal.logical.rules.randomize_blocks import ReorderRandomizeBlocksRule
 from ray.data._internal.logical.rules.set_read_parallelism import SetReadParallelismRule
@@ -27,6 +32,9 @@ _LOGICAL_RULESET = Ruleset(
     [
         ReorderRandomizeBlocksRule,
         InheritBatchFormatRule,
+        LimitFusionRule,
+        DropRedundantLimitRule,
+        SortLimitPushdownRule,
     ]
 )
 
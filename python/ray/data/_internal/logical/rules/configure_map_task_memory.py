@@ -1,5 +1,4 @@
 import abc
-import copy
 from typing import Any, Dict, Optional
 
 from ray.data._internal.execution.operators.map_operator import MapOperator
@@ -19,7 +18,8 @@ class ConfigureMapTaskMemoryRule(Rule, abc.ABC):
             ) -> Dict[str, Any]:
                 assert isinstance(op, MapOperator), op
 
-                static_ray_remote_args = copy.deepcopy(op._ray_remote_args)
+                # Only read from, so there's no need to copy it for every task.
+                static_ray_remote_args = op._ray_remote_args
 
                 dynamic_ray_remote_args = {}
                 if original_ray_remote_args_fn is not None:
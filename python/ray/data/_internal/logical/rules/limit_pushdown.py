@@ -1,8 +1,9 @@
 import copy
 from collections import deque
-from typing import Iterable, List
+from typing import Callable, Dict, Iterable, List
 
 from ray.data._internal.logical.interfaces import LogicalOperator, LogicalPlan, Rule
+from ray.data._internal.logical.operators.all_to_all_operator import Sort
 from ray.data._internal.logical.operators.one_to_one_operator import (
     AbstractOneToOne,
     Limit,
@@ -10,6 +11,77 @@ from ray.data._internal.logical.operators.one_to_one_operator import (
 from ray.data._internal.logical.operators.read_operator import Read
 
 
+def _transform_dag(
+    dag: LogicalOperator,
+    fn: Callable[[LogicalOperator], LogicalOperator],
+) -> LogicalOperator:
+    """Apply ``fn`` to every operator of ``dag`` in post-order, and return the
+    resulting DAG.
+
+    ``fn`` is called with an operator whose inputs have already been transformed,
+    and returns either the operator itself or a replacement for it. Operators whose
+    inputs change are copied instead of being modified in place, because logical
+    operators can be shared with other Datasets.
+    """
+    original_ops = {id(op) for op in dag.post_order_iter()}
+    transformed: Dict[int, LogicalOperator] = {}
+
+    def transform(op: LogicalOperator) -> LogicalOperator:
+        if id(op) in transformed:
+            return transformed[id(op)]
+        new_inputs = [transform(input_op) for input_op in op.input_dependencies]
+        new_op = op
+        if any(
+            new_input is not input_op
+            for new_input, input_op in zip(new_inputs, op.input_dependencies)
+        ):
+            new_op = copy.copy(op)
+            new_op._input_dependencies = new_inputs
+        new_op = fn(new_op)
+        transformed[id(op)] = new_op
+        return new_op
+
+    new_dag = transform(dag)
+
+    # Rebuild the output dependencies of the newly created operators. Those of the
+    # original operators are left untouched.
+    new_ops = {
+        id(op): op for op in new_dag.post_order_iter() if id(op) not in original_ops
+    }
+    for op in new_ops.values():
+        op._output_dependencies = []
+    for op in new_ops.values():
+        for input_op in op.input_dependencies:
+            if id(input_op) in new_ops:
+                input_op._output_dependencies.append(op)
+    return new_dag
+
+
+class LimitFusionRule(Rule):
+    """Rule for fusing consecutive Limit operators into a single Limit operator,
+    i.e. `Limit[n] -> Limit[m]` becomes `Limit[min(n, m)]`.
+    """
+
+    def apply(self, plan: LogicalPlan) -> LogicalPlan:
+        optimized_dag = _transform_dag(plan.dag, self._fuse_limits)
+        return LogicalPlan(dag=optimized_dag, context=plan.context)
+
+    @staticmethod
+    def _fuse_limits(op: LogicalOperator) -> LogicalOperator:
+        # Inputs are transformed first, so a chain of Limit operators has already
+        # been fused into the single Limit operator right before this one.
+        if not isinstance(op, Limit) or not isinstance(op.input_dependency, Limit):
+            return op
+        upstream_op = op.input_dependency
+        if upstream_op._limit <= op._limit:
+            return upstream_op
+
+        fused_limit_op = copy.copy(upstream_op)
+        fused_limit_op._limit = op._limit
+        fused_limit_op._name = op._name
+        return fused_limit_op
+
+
 class LimitPushdownRule(Rule):
     """Rule for pushing down the limit operator.
 
@@ -19,13 +91,14 @@ class LimitPushdownRule(Rule):
     or any operator which could potentially change the number of output rows.
 
     In addition, we also fuse consecutive Limit operators into a single
-    Limit operator, i.e. `Limit[n] -> Limit[m]` becomes `Limit[min(n, m)]`.
+    Limit operator with `LimitFusionRule`.
     """
 
     def apply(self, plan: LogicalPlan) -> LogicalPlan:
         optimized_dag = self._apply_limit_pushdown(plan.dag)
-        optimized_dag = self._apply_limit_fusion(optimized_dag)
-        return LogicalPlan(dag=optimized_dag, context=plan.context)
+        return LimitFusionRule().apply(
+            LogicalPlan(dag=optimized_dag, context=plan.context)
+        )
 
     def _apply_limit_pushdown(self, op: LogicalOperator) -> LogicalOperator:
         """Given a DAG of LogicalOperators, traverse the DAG and push down
@@ -94,40 +167,61 @@ class LimitPushdownRule(Rule):
 
         return current_op
 
-    def _apply_limit_fusion(self, op: LogicalOperator) -> LogicalOperator:
-        """Given a DAG of LogicalOperators, traverse the DAG and fuse all
-        back-to-back Limit operators, i.e.
-        Limit[n] -> Limit[m] becomes Limit[min(n, m)].
 
-        Returns a new LogicalOperator with the Limit operators fusion applied."""
+class SortLimitPushdownRule(Rule):
+    """Rule for pushing a Limit operator into the Sort operator right before it,
+    i.e. `Sort -> Limit[n]` becomes `Sort[limit=n] -> Limit[n]`.
 
-        # Post-order traversal.
-        nodes: Iterable[LogicalOperator] = deque()
-        for node in op.post_order_iter():
-            nodes.appendleft(node)
+    The Limit operator is kept. The Sort operator only uses the limit to drop rows
+    that can't be part of its first `n` output rows before shuffling them.
+    """
 
-        while len(nodes) > 0:
-            current_op = nodes.pop()
+    def apply(self, plan: LogicalPlan) -> LogicalPlan:
+        optimized_dag = _transform_dag(plan.dag, self._push_limit_into_sort)
+        return LogicalPlan(dag=optimized_dag, context=plan.context)
 
-            # If we encounter two back-to-back Limit operators, fuse them.
-            if isinstance(current_op, Limit):
-                upstream_op = current_op.input_dependency
-                if isinstance(upstream_op, Limit):
-                    new_limit = min(current_op._limit, upstream_op._limit)
-                    fused_limit_op = Limit(upstream_op.input_dependency, new_limit)
-
-                    # Link the fused Limit operator to its input and output ops, i.e.:
-                    # `upstream_input -> limit_upstream -> limit_downstream -> downstream_output`  # noqa: E501
-                    # becomes `upstream_input -> fused_limit -> downstream_output`
-                    fused_limit_op._input_dependencies = upstream_op.input_dependencies
-                    fused_limit_op._output_dependencies = current_op.output_dependencies
-
-                    # Replace occurrences of the upstream Limit operator in
-                    # output_dependencies with the newly fused Limit operator.
-                    upstream_input = upstream_op.input_dependency
-                    upstream_input._output_dependencies = [fused_limit_op]
-
-                    for current_output in current_op.output_dependencies:
-                        current_output._input_dependencies = [fused_limit_op]
-                    nodes.append(fused_limit_op)
-        return current_op
+    @staticmethod
+    def _push_limit_into_sort(op: LogicalOperator) -> LogicalOperator:
+        if not isinstance(op, Limit) or not isinstance(op.input_dependency, Sort):
+            return op
+        sort_op = op.input_dependency
+        if sort_op._limit is not None and sort_op._limit <= op._limit:
+            return op
+
+        sort_op_copy = copy.copy(sort_op)
+        sort_op_copy._limit = op._limit
+        limit_op_copy = copy.copy(op)
+        limit_op_copy._input_dependencies = [sort_op_copy]
+        return limit_op_copy
+
+
+class DropRedundantLimitRule(Rule):
+    """Rule for removing Limit operators that can't drop any rows, i.e. whose input
+    is known to produce at most `limit` rows, e.g. `Read[ReadRange]` of 100 rows
+    followed by `Limit[limit=100]`.
+
+    The number of rows is taken from the input operator's aggregate output
+    metadata, so the Limit is only removed if the number of rows is known before
+    execution. The metadata of a Read is only used if it's already cached, because
+    computing it calls the datasource on the driver.
+    """
+
+    def apply(self, plan: LogicalPlan) -> LogicalPlan:
+        optimized_dag = _transform_dag(plan.dag, self._drop_redundant_limit)
+        return LogicalPlan(dag=optimized_dag, context=plan.context)
+
+    @staticmethod
+    def _drop_redundant_limit(op: LogicalOperator) -> LogicalOperator:
+        if not isinstance(op, Limit):
+            return op
+        input_op = op.input_dependency
+        if any(
+            isinstance(upstream_op, Read)
+            and not upstream_op.is_output_metadata_cached()
+            for upstream_op in input_op.post_order_iter()
+        ):
+            return op
+        num_rows = input_op.aggregate_output_metadata().num_rows
+        if num_rows is not None and num_rows <= op._limit:
+            return input_op
+        return op
@@ -104,7 +104,8 @@ class SortTaskSpec(ExchangeTaskSpec):
 
     Sorting (`map`): each block is sorted locally, then partitioned into smaller
     blocks according to the boundaries. Each partitioned block is passed to a merge
-    task.
+    task. If a limit is set, each sorted block is truncated to the limit before
+    being partitioned, since rows beyond it can't be part of the final output.
 
     Merging (`reduce`): a merge task would receive a block from every worker that
     consists of items in a certain range. It then merges the sorted blocks into one
@@ -118,9 +119,10 @@ class SortTaskSpec(ExchangeTaskSpec):
         boundaries: List[T],
         sort_key: SortKey,
         batch_format: str,
+        limit: Optional[int] = None,
     ):
         super().__init__(
-            map_args=[boundaries, sort_key],
+            map_args=[boundaries, sort_key, limit],
             reduce_args=[sort_key, batch_format],
         )
 
@@ -131,10 +133,19 @@ class SortTaskSpec(ExchangeTaskSpec):
         output_num_blocks: int,
         boundaries: List[T],
         sort_key: SortKey,
+        limit: Optional[int] = None,
     ) -> List[Union[BlockMetadata, Block]]:
         stats = BlockExecStats.builder()
-        out = BlockAccessor.for_block(block).sort_and_partition(boundaries, sort_key)
-        meta = BlockAccessor.for_block(block).get_metadata(exec_stats=stats.build())
+        accessor = BlockAccessor.for_block(block)
+        if limit is not None and accessor.num_rows() > limit:
+            sorted_block = accessor.sort(sort_key)
+            truncated = BlockAccessor.for_block(sorted_block).slice(0, limit, copy=True)
+            out = BlockAccessor.for_block(truncated).sort_and_partition(
+                boundaries, sort_key
+            )
+        else:
+            out = accessor.sort_and_partition(boundaries, sort_key)
+        meta = accessor.get_metadata(exec_stats=stats.build())
         return out + [meta]
 
     @staticmethod
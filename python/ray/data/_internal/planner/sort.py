@@ -23,8 +23,14 @@ def generate_sort_fn(
     batch_format: str,
     data_context: DataContext,
     _debug_limit_shuffle_execution_to_num_blocks: Optional[int] = None,
+    limit: Optional[int] = None,
 ) -> AllToAllTransformFn:
-    """Generate function to sort blocks by the specified key column or key function."""
+    """Generate function to sort blocks by the specified key column or key function.
+
+    If ``limit`` is set, only the first ``limit`` rows of the sorted output are
+    needed, so each input block is truncated to its ``limit`` smallest rows before
+    being shuffled.
+    """
 
     def fn(
         sort_key: SortKey,
@@ -61,7 +67,10 @@ def generate_sort_fn(
                 boundaries = boundaries[::-1]
             num_outputs = len(boundaries) + 1
         sort_spec = SortTaskSpec(
-            boundaries=boundaries, sort_key=sort_key, batch_format=batch_format
+            boundaries=boundaries,
+            sort_key=sort_key,
+            batch_format=batch_format,
+            limit=limit,
         )
 
         if data_context.shuffle_strategy == ShuffleStrategy.SORT_SHUFFLE_PUSH_BASED:
@@ -5629,10 +5629,20 @@ class Dataset:
     def _block_num_rows(self) -> List[int]:
         get_num_rows = cached_remote_fn(_get_num_rows)
         num_rows = []
+        # Indices into `num_rows` of blocks whose metadata doesn't include the
+        # number of rows, mapped to the refs of the tasks that compute it.
+        pending_num_rows = {}
         for ref_bundle in self.iter_internal_ref_bundles():
-            for block_ref in ref_bundle.block_refs:
-                num_rows.append(get_num_rows.remote(block_ref))
-        return ray.get(num_rows)
+            for block_ref, metadata in ref_bundle.blocks:
+                if metadata.num_rows is None:
+                    pending_num_rows[len(num_rows)] = get_num_rows.remote(block_ref)
+                num_rows.append(metadata.num_rows)
+        if pending_num_rows:
+            for idx, block_num_rows in zip(
+                pending_num_rows.keys(), ray.get(list(pending_num_rows.values()))
+            ):
+                num_rows[idx] = block_num_rows
+        return num_rows
 
     def _meta_count(self) -> Optional[int]:
         return self._plan.meta_count()
@@ -263,6 +263,16 @@ def restore_data_context(request):
     ray.data.context.DataContext._set_current(original)
 
 
+@pytest.fixture(scope="session")
+def fashion_mnist_root(tmp_path_factory):
+    """Download FashionMNIST once per session and return its root directory."""
+    import torchvision
+
+    root = tmp_path_factory.mktemp("fashion_mnist")
+    torchvision.datasets.FashionMNIST(root, download=True)
+    return root
+
+
 @pytest.fixture
 def disable_fallback_to_object_extension(request, restore_data_context):
     """Disables fallback to ArrowPythonObjectType"""
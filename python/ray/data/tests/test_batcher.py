@@ -168,6 +168,19 @@ def test_shuffling_batcher():
     )
 
 
+@pytest.mark.parametrize("ensure_copy", [False, True])
+def test_batcher_slices_batches_across_blocks(ensure_copy):
+    batcher = Batcher(batch_size=3, ensure_copy=ensure_copy)
+    batcher.add(pa.table({"foo": list(range(7))}))
+    batcher.add(pa.table({"foo": list(range(7, 10))}))
+    batcher.done_adding()
+
+    batches = []
+    while batcher.has_any():
+        batches.append(batcher.next_batch()["foo"].to_pylist())
+    assert batches == [[0, 1, 2], [3, 4, 5], [6, 7, 8], [9]]
+
+
 def test_batching_pyarrow_table_with_many_chunks():
     """Make sure batching a pyarrow table with many chunks is fast.
 
@@ -1,5 +1,6 @@
-import itertools
 import sys
+from collections import Counter
+from types import SimpleNamespace
 from typing import List, Optional
 from unittest.mock import MagicMock
 
@@ -10,7 +11,8 @@ import pytest
 
 import ray
 from ray.data._internal.datasource.parquet_datasink import ParquetDatasink
-from ray.data._internal.execution.interfaces.op_runtime_metrics import OpRuntimeMetrics
+from ray.data._internal.datasource.range_datasource import RangeDatasource
+from ray.data._internal.execution.interfaces import PhysicalOperator
 from ray.data._internal.execution.operators.base_physical_operator import (
     AllToAllOperator,
 )
@@ -49,7 +51,10 @@ from ray.data._internal.logical.operators.map_operator import (
 )
 from ray.data._internal.logical.operators.n_ary_operator import Zip
 from ray.data._internal.logical.operators.write_operator import Write
-from ray.data._internal.logical.optimizers import PhysicalOptimizer
+from ray.data._internal.logical.optimizers import (
+    LogicalOptimizer,
+    PhysicalOptimizer,
+)
 from ray.data._internal.logical.rules.configure_map_task_memory import (
     ConfigureMapTaskMemoryUsingOutputSize,
 )
@@ -63,7 +68,7 @@ from ray.data._internal.planner.planner import Planner
 from ray.data._internal.stats import DatasetStats
 from ray.data.aggregate import Count
 from ray.data.block import BlockMetadata
-from ray.data.context import DataContext
+from ray.data.context import DataContext, ShuffleStrategy
 from ray.data.datasource import Datasource
 from ray.data.datasource.datasource import ReadTask
 from ray.data.tests.conftest import *  # noqa
@@ -72,22 +77,63 @@ from ray.data.tests.util import column_udf, extract_values, named_values
 from ray.tests.conftest import *  # noqa
 
 
+@pytest.fixture
+def planner():
+    return Planner()
+
+
+@pytest.fixture
+def ctx():
+    return DataContext.get_current()
+
+
+# Fusion tests only check how operators are planned and named, which doesn't depend
+# on the shuffle strategy, so they run against a single one.
+_with_single_shuffle_strategy = pytest.mark.parametrize(
+    "configure_shuffle_method", [ShuffleStrategy.SORT_SHUFFLE_PULL_BASED], indirect=True
+)
+
+_PHYSICAL_OPTIMIZER = PhysicalOptimizer()
+
+
+def _plan_and_optimize(planner: Planner, logical_plan: LogicalPlan) -> PhysicalOperator:
+    """Plan the given logical plan and return the DAG of the optimized physical
+    plan. The physical optimizer holds no state, so it's shared across tests."""
+    physical_plan = planner.plan(logical_plan)
+    return _PHYSICAL_OPTIMIZER.optimize(physical_plan).dag
+
+
+_OP_NAME_WHITE_LIST = frozenset(_op_name_white_list)
+
+
 def _check_usage_record(op_names: List[str], clear_after_check: Optional[bool] = True):
     """Check if operators with given names in `op_names` have been used.
     If `clear_after_check` is True, we clear the list of recorded operators
     (so that subsequent checks do not use existing records of operator usage)."""
-    for op_name in op_names:
-        assert op_name in _op_name_white_list
-        with _recorded_operators_lock:
-            assert _recorded_operators.get(op_name, 0) > 0, (
-                op_name,
-                _recorded_operators,
-            )
-    if clear_after_check:
-        with _recorded_operators_lock:
+    op_names = frozenset(op_names)
+    assert op_names <= _OP_NAME_WHITE_LIST, op_names - _OP_NAME_WHITE_LIST
+    with _recorded_operators_lock:
+        recorded = {name for name, count in _recorded_operators.items() if count > 0}
+        missing = op_names - recorded
+        assert not missing, (missing, dict(_recorded_operators))
+        if clear_after_check:
             _recorded_operators.clear()
 
 
+def _range(n: int, blocks: int = 1) -> ray.data.Dataset:
+    """In-memory equivalent of `ray.data.range` for tests that don't exercise the
+    read path, so that no read tasks need to be scheduled."""
+    tables = [pa.table({"id": ids}) for ids in np.array_split(np.arange(n), blocks)]
+    return ray.data.from_arrow(tables)
+
+
+def _assert_id_counts(ds, expected):
+    """Check that the "id" column of `ds` holds the `expected` values, each
+    with the same multiplicity, in any order."""
+    ids = extract_values("id", ds.take_all())
+    assert Counter(ids) == Counter(expected), ids
+
+
 def _check_valid_plan_and_result(
     ds,
     expected_plan,
@@ -98,13 +144,12 @@ def _check_valid_plan_and_result(
     assert str(ds._plan._logical_plan.dag) == expected_plan
 
     expected_physical_plan_ops = expected_physical_plan_ops or []
-    for op in expected_physical_plan_ops:
-        assert op in ds.stats(), f"Operator {op} not found: {ds.stats()}"
+    stats_str = ds.stats()
+    missing = [op for op in expected_physical_plan_ops if op not in stats_str]
+    assert not missing, f"Operators {missing} not found: {stats_str}"
 
 
-def test_read_operator(ray_start_regular_shared_2_cpus):
-    ctx = DataContext.get_current()
-    planner = Planner()
+def test_read_operator(ray_start_regular_shared_2_cpus, planner, ctx):
     op = get_parquet_read_logical_op()
     plan = LogicalPlan(op, ctx)
     physical_op = planner.plan(plan).dag
@@ -125,7 +170,9 @@ def test_read_operator_emits_warning_for_large_read_tasks():
             return None
 
         def get_read_tasks(self, parallelism: int) -> List[ReadTask]:
-            large_object = np.zeros((128, 1024, 1024), dtype=np.uint8)  # 128 MiB
+            # The warning is based on the serialized size of the read task, not on
+            # the array contents, so skip zero-filling the buffer.
+            large_object = np.empty((128, 1024, 1024), dtype=np.uint8)  # 128 MiB
 
             def read_fn():
                 _ = large_object
@@ -137,24 +184,16 @@ def test_read_operator_emits_warning_for_large_read_tasks():
         ray.data.read_datasource(StubDatasource()).materialize()
 
 
-def test_split_blocks_operator(ray_start_regular_shared_2_cpus):
-    ctx = DataContext.get_current()
-
-    planner = Planner()
+def test_split_blocks_operator(ray_start_regular_shared_2_cpus, planner, ctx):
     op = get_parquet_read_logical_op(parallelism=10)
     logical_plan = LogicalPlan(op, ctx)
-    physical_plan = planner.plan(logical_plan)
-    physical_plan = PhysicalOptimizer().optimize(physical_plan)
-    physical_op = physical_plan.dag
+    physical_op = _plan_and_optimize(planner, logical_plan)
 
     assert physical_op.name == "ReadParquet->SplitBlocks(10)"
     assert isinstance(physical_op, MapOperator)
     assert len(physical_op.input_dependencies) == 1
     assert isinstance(physical_op.input_dependencies[0], InputDataBuffer)
-    assert (
-        physical_op.actual_target_max_block_size
-        == DataContext.get_current().target_max_block_size
-    )
+    assert physical_op.actual_target_max_block_size == ctx.target_max_block_size
     assert physical_op._additional_split_factor == 10
 
     # Test that split blocks prevents fusion.
@@ -163,9 +202,7 @@ def test_split_blocks_operator(ray_start_regular_shared_2_cpus):
         lambda x: x,
     )
     logical_plan = LogicalPlan(op, ctx)
-    physical_plan = planner.plan(logical_plan)
-    physical_plan = PhysicalOptimizer().optimize(physical_plan)
-    physical_op = physical_plan.dag
+    physical_op = _plan_and_optimize(planner, logical_plan)
     assert physical_op.name == "MapBatches(<lambda>)"
     assert len(physical_op.input_dependencies) == 1
     up_physical_op = physical_op.input_dependencies[0]
@@ -173,9 +210,7 @@ def test_split_blocks_operator(ray_start_regular_shared_2_cpus):
     assert up_physical_op.name == "ReadParquet->SplitBlocks(10)"
 
 
-def test_from_operators(ray_start_regular_shared_2_cpus):
-    ctx = DataContext.get_current()
-
+def test_from_operators(ray_start_regular_shared_2_cpus, planner, ctx):
     op_classes = [
         FromArrow,
         FromItems,
@@ -183,7 +218,6 @@ def test_from_operators(ray_start_regular_shared_2_cpus):
         FromPandas,
     ]
     for op_cls in op_classes:
-        planner = Planner()
         op = op_cls([], [])
         plan = LogicalPlan(op, ctx)
         physical_op = planner.plan(plan).dag
@@ -207,54 +241,46 @@ def test_from_items_e2e(ray_start_regular_shared_2_cpus):
     _check_usage_record(["FromItems"])
 
 
-def test_map_operator_udf_name(ray_start_regular_shared_2_cpus):
-    # Test the name of the Map operator with different types of UDF.
-    def normal_function(x):
+def normal_function(x):
+    return x
+
+
+class CallableClass:
+    def __call__(self, x):
         return x
 
-    lambda_function = lambda x: x  # noqa: E731
 
-    class CallableClass:
-        def __call__(self, x):
-            return x
+class NormalClass:
+    def method(self, x):
+        return x
 
-    class NormalClass:
-        def method(self, x):
-            return x
 
-    udf_list = [
+@pytest.mark.parametrize(
+    "udf,expected_name",
+    [
         # A nomral function.
-        normal_function,
+        (normal_function, "normal_function"),
         # A lambda function
-        lambda_function,
+        (lambda x: x, "<lambda>"),
         # A callable class.
-        CallableClass,
+        (CallableClass, "CallableClass"),
         # An instance of a callable class.
-        CallableClass(),
+        (CallableClass(), "CallableClass"),
         # A normal class method.
-        NormalClass().method,
-    ]
-
-    expected_names = [
-        "normal_function",
-        "<lambda>",
-        "CallableClass",
-        "CallableClass",
-        "NormalClass.method",
-    ]
-
-    for udf, expected_name in zip(udf_list, expected_names):
-        op = MapRows(
-            get_parquet_read_logical_op(),
-            udf,
-        )
-        assert op.name == f"Map({expected_name})"
-
+        (NormalClass().method, "NormalClass.method"),
+    ],
+    ids=["func", "lambda", "cls", "instance", "method"],
+)
+def test_map_operator_udf_name(ray_start_regular_shared_2_cpus, udf, expected_name):
+    # Test the name of the Map operator with different types of UDF.
+    op = MapRows(
+        get_parquet_read_logical_op(),
+        udf,
+    )
+    assert op.name == f"Map({expected_name})"
 
-def test_map_batches_operator(ray_start_regular_shared_2_cpus):
-    ctx = DataContext.get_current()
 
-    planner = Planner()
+def test_map_batches_operator(ray_start_regular_shared_2_cpus, planner, ctx):
     read_op = get_parquet_read_logical_op()
     op = MapBatches(
         read_op,
@@ -273,16 +299,13 @@ def test_map_batches_operator(ray_start_regular_shared_2_cpus):
 
 
 def test_map_batches_e2e(ray_start_regular_shared_2_cpus):
-    ds = ray.data.range(5)
+    ds = _range(5)
     ds = ds.map_batches(column_udf("id", lambda x: x))
     assert extract_values("id", ds.take_all()) == list(range(5)), ds
-    _check_usage_record(["ReadRange", "MapBatches"])
-
+    _check_usage_record(["FromArrow", "MapBatches"])
 
-def test_map_rows_operator(ray_start_regular_shared_2_cpus):
-    ctx = DataContext.get_current()
 
-    planner = Planner()
+def test_map_rows_operator(ray_start_regular_shared_2_cpus, planner, ctx):
     read_op = get_parquet_read_logical_op()
     op = MapRows(
         read_op,
@@ -298,18 +321,13 @@ def test_map_rows_operator(ray_start_regular_shared_2_cpus):
 
 
 def test_map_rows_e2e(ray_start_regular_shared_2_cpus):
-    ds = ray.data.range(5)
+    ds = _range(5)
     ds = ds.map(column_udf("id", lambda x: x + 1))
-    expected = [1, 2, 3, 4, 5]
-    actual = sorted(extract_values("id", ds.take_all()))
-    assert actual == expected, f"Expected {expected}, but got {actual}"
-    _check_usage_record(["ReadRange", "Map"])
-
+    assert extract_values("id", ds.take_all()) == [1, 2, 3, 4, 5], ds
+    _check_usage_record(["FromArrow", "Map"])
 
-def test_filter_operator(ray_start_regular_shared_2_cpus):
-    ctx = DataContext.get_current()
 
-    planner = Planner()
+def test_filter_operator(ray_start_regular_shared_2_cpus, planner, ctx):
     read_op = get_parquet_read_logical_op()
     op = Filter(
         read_op,
@@ -322,52 +340,46 @@ def test_filter_operator(ray_start_regular_shared_2_cpus):
     assert isinstance(physical_op, MapOperator)
     assert len(physical_op.input_dependencies) == 1
     assert isinstance(physical_op.input_dependencies[0], MapOperator)
-    assert (
-        physical_op.actual_target_max_block_size
-        == DataContext.get_current().target_max_block_size
-    )
+    assert physical_op.actual_target_max_block_size == ctx.target_max_block_size
 
 
 def test_filter_e2e(ray_start_regular_shared_2_cpus):
-    ds = ray.data.range(5)
+    ds = _range(5)
     ds = ds.filter(fn=lambda x: x["id"] % 2 == 0)
-    assert sorted(extract_values("id", ds.take_all())) == [0, 2, 4], ds
-    _check_usage_record(["ReadRange", "Filter"])
+    assert extract_values("id", ds.take_all()) == [0, 2, 4], ds
+    _check_usage_record(["FromArrow", "Filter"])
+
 
+@pytest.fixture
+def iris_mapped_ds(ray_start_regular_shared_2_cpus):
+    return ray.data.read_parquet("example://iris.parquet").map_batches(lambda d: d)
 
-def test_project_operator_select(ray_start_regular_shared_2_cpus):
+
+def test_project_operator_select(iris_mapped_ds, planner):
     """
     Checks that the physical plan is properly generated for the Project operator from
     select columns.
     """
-    path = "example://iris.parquet"
-    ds = ray.data.read_parquet(path)
-    ds = ds.map_batches(lambda d: d)
     cols = ["sepal.length", "petal.width"]
-    ds = ds.select_columns(cols)
+    ds = iris_mapped_ds.select_columns(cols)
 
     logical_plan = ds._plan._logical_plan
     op = logical_plan.dag
     assert isinstance(op, Project), op.name
     assert op.cols == cols
 
-    physical_plan = Planner().plan(logical_plan)
-    physical_plan = PhysicalOptimizer().optimize(physical_plan)
-    physical_op = physical_plan.dag
+    physical_op = _plan_and_optimize(planner, logical_plan)
     assert isinstance(physical_op, TaskPoolMapOperator)
     assert isinstance(physical_op.input_dependency, TaskPoolMapOperator)
 
 
-def test_project_operator_rename(ray_start_regular_shared_2_cpus):
+def test_project_operator_rename(iris_mapped_ds, planner):
     """
     Checks that the physical plan is properly generated for the Project operator from
     rename columns.
     """
-    path = "example://iris.parquet"
-    ds = ray.data.read_parquet(path)
-    ds = ds.map_batches(lambda d: d)
     cols_rename = {"sepal.length": "sepal_length", "petal.width": "pedal_width"}
-    ds = ds.rename_columns(cols_rename)
+    ds = iris_mapped_ds.rename_columns(cols_rename)
 
     logical_plan = ds._plan._logical_plan
     op = logical_plan.dag
@@ -375,17 +387,12 @@ def test_project_operator_rename(ray_start_regular_shared_2_cpus):
     assert not op.cols
     assert op.cols_rename == cols_rename
 
-    physical_plan = Planner().plan(logical_plan)
-    physical_plan = PhysicalOptimizer().optimize(physical_plan)
-    physical_op = physical_plan.dag
+    physical_op = _plan_and_optimize(planner, logical_plan)
     assert isinstance(physical_op, TaskPoolMapOperator)
     assert isinstance(physical_op.input_dependency, TaskPoolMapOperator)
 
 
-def test_flat_map(ray_start_regular_shared_2_cpus):
-    ctx = DataContext.get_current()
-
-    planner = Planner()
+def test_flat_map(ray_start_regular_shared_2_cpus, planner, ctx):
     read_op = get_parquet_read_logical_op()
     op = FlatMap(
         read_op,
@@ -398,32 +405,29 @@ def test_flat_map(ray_start_regular_shared_2_cpus):
     assert isinstance(physical_op, MapOperator)
     assert len(physical_op.input_dependencies) == 1
     assert isinstance(physical_op.input_dependencies[0], MapOperator)
-    assert (
-        physical_op.actual_target_max_block_size
-        == DataContext.get_current().target_max_block_size
-    )
+    assert physical_op.actual_target_max_block_size == ctx.target_max_block_size
 
 
 def test_flat_map_e2e(ray_start_regular_shared_2_cpus):
-    ds = ray.data.range(2)
+    ds = _range(2)
     ds = ds.flat_map(fn=lambda x: [{"id": x["id"]}, {"id": x["id"]}])
     assert extract_values("id", ds.take_all()) == [0, 0, 1, 1], ds
-    _check_usage_record(["ReadRange", "FlatMap"])
+    _check_usage_record(["FromArrow", "FlatMap"])
 
 
 def test_column_ops_e2e(ray_start_regular_shared_2_cpus):
-    ds = ray.data.range(2)
+    ds = _range(2)
     ds = ds.add_column(fn=lambda df: df.iloc[:, 0], col="new_col")
     assert ds.take_all() == [{"id": 0, "new_col": 0}, {"id": 1, "new_col": 1}], ds
-    _check_usage_record(["ReadRange", "MapBatches"])
+    _check_usage_record(["FromArrow", "MapBatches"])
 
     select_ds = ds.select_columns(cols=["new_col"])
     assert select_ds.take_all() == [{"new_col": 0}, {"new_col": 1}]
-    _check_usage_record(["ReadRange", "MapBatches"])
+    _check_usage_record(["FromArrow", "MapBatches"])
 
     ds = ds.drop_columns(cols=["new_col"])
     assert ds.take_all() == [{"id": 0}, {"id": 1}], ds
-    _check_usage_record(["ReadRange", "MapBatches"])
+    _check_usage_record(["FromArrow", "MapBatches"])
 
 
 def test_random_sample_e2e(ray_start_regular_shared_2_cpus):
@@ -447,10 +451,7 @@ def test_random_sample_e2e(ray_start_regular_shared_2_cpus):
     _check_usage_record(["ReadRange", "MapBatches"])
 
 
-def test_random_shuffle_operator(ray_start_regular_shared_2_cpus):
-    ctx = DataContext.get_current()
-
-    planner = Planner()
+def test_random_shuffle_operator(ray_start_regular_shared_2_cpus, planner, ctx):
     read_op = get_parquet_read_logical_op()
     op = RandomShuffle(
         read_op,
@@ -463,22 +464,31 @@ def test_random_shuffle_operator(ray_start_regular_shared_2_cpus):
     assert isinstance(physical_op, AllToAllOperator)
     assert len(physical_op.input_dependencies) == 1
     assert isinstance(physical_op.input_dependencies[0], MapOperator)
-    assert (
-        physical_op.actual_target_max_block_size
-        == DataContext.get_current().target_shuffle_max_block_size
-    )
+    assert physical_op.actual_target_max_block_size == ctx.target_shuffle_max_block_size
 
     # Check that the linked logical operator is the same the input op.
     assert physical_op._logical_operators == [op]
 
 
-def test_random_shuffle_e2e(ray_start_regular_shared_2_cpus, configure_shuffle_method):
+def test_random_shuffle_e2e(ray_start_regular_shared_2_cpus):
+    # The seed handling doesn't depend on the shuffle strategy, so this only runs
+    # with the default one. See `test_random_shuffle_backend_parity` below.
     ds = ray.data.range(12, override_num_blocks=4)
     r1 = extract_values("id", ds.random_shuffle(seed=0).take_all())
     r2 = extract_values("id", ds.random_shuffle(seed=1024).take_all())
     assert r1 != r2, (r1, r2)
-    assert sorted(r1) == [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11], r1
-    assert sorted(r2) == [0, 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11], r2
+    assert Counter(r1) == Counter(range(12)), r1
+    assert Counter(r2) == Counter(range(12)), r2
+    _check_usage_record(["ReadRange", "RandomShuffle"])
+
+
+def test_random_shuffle_backend_parity(
+    ray_start_regular_shared_2_cpus, configure_shuffle_method
+):
+    # Check that every shuffle strategy outputs a permutation of the input.
+    ds = ray.data.range(12, override_num_blocks=4).random_shuffle(seed=0)
+    r = extract_values("id", ds.take_all())
+    assert Counter(r) == Counter(range(12)), r
     _check_usage_record(["ReadRange", "RandomShuffle"])
 
 
@@ -486,10 +496,7 @@ def test_random_shuffle_e2e(ray_start_regular_shared_2_cpus, configure_shuffle_m
     "shuffle",
     [True, False],
 )
-def test_repartition_operator(ray_start_regular_shared_2_cpus, shuffle):
-    ctx = DataContext.get_current()
-
-    planner = Planner()
+def test_repartition_operator(ray_start_regular_shared_2_cpus, planner, ctx, shuffle):
     read_op = get_parquet_read_logical_op()
     op = Repartition(read_op, num_outputs=5, shuffle=shuffle)
     plan = LogicalPlan(op, ctx)
@@ -502,21 +509,22 @@ def test_repartition_operator(ray_start_regular_shared_2_cpus, shuffle):
     if shuffle:
         assert (
             physical_op.actual_target_max_block_size
-            == DataContext.get_current().target_shuffle_max_block_size
+            == ctx.target_shuffle_max_block_size
         )
     else:
-        assert (
-            physical_op.actual_target_max_block_size
-            == DataContext.get_current().target_max_block_size
-        )
+        assert physical_op.actual_target_max_block_size == ctx.target_max_block_size
 
     # Check that the linked logical operator is the same the input op.
     assert physical_op._logical_operators == [op]
 
 
 @pytest.mark.parametrize(
-    "shuffle",
-    [True, False],
+    "shuffle,configure_shuffle_method",
+    # Split repartition (`shuffle=False`) doesn't use the shuffle strategy, so it's
+    # only tested with a single one.
+    [(True, strategy) for strategy in ShuffleStrategy]
+    + [(False, ShuffleStrategy.SORT_SHUFFLE_PULL_BASED)],
+    indirect=["configure_shuffle_method"],
 )
 def test_repartition_e2e(
     ray_start_regular_shared_2_cpus, configure_shuffle_method, shuffle
@@ -532,10 +540,10 @@ def test_repartition_e2e(
             assert "RepartitionSplit" in ds_stats.metadata
         assert "RepartitionReduce" in ds_stats.metadata
 
-    ds = ray.data.range(10000, override_num_blocks=10).repartition(20, shuffle=shuffle)
+    ds = ray.data.range(400, override_num_blocks=10).repartition(20, shuffle=shuffle)
     assert ds._plan.initial_num_blocks() == 20, ds._plan.initial_num_blocks()
-    assert ds.sum() == sum(range(10000))
-    assert ds._block_num_rows() == [500] * 20, ds._block_num_rows()
+    assert ds.sum() == sum(range(400))
+    assert ds._block_num_rows() == [20] * 20, ds._block_num_rows()
     _check_repartition_usage_and_stats(ds)
 
     # Test num_output_blocks > num_rows to trigger empty block handling.
@@ -566,20 +574,19 @@ def test_repartition_e2e(
     _check_repartition_usage_and_stats(ds)
 
 
-def test_read_map_batches_operator_fusion(ray_start_regular_shared_2_cpus):
-    ctx = DataContext.get_current()
-
+def test_read_map_batches_operator_fusion(
+    ray_start_regular_shared_2_cpus,
+    planner,
+    ctx,
+):
     # Test that Read is fused with MapBatches.
-    planner = Planner()
     read_op = get_parquet_read_logical_op(parallelism=1)
     op = MapBatches(
         read_op,
         lambda x: x,
     )
     logical_plan = LogicalPlan(op, ctx)
-    physical_plan = planner.plan(logical_plan)
-    physical_plan = PhysicalOptimizer().optimize(physical_plan)
-    physical_op = physical_plan.dag
+    physical_op = _plan_and_optimize(planner, logical_plan)
 
     assert op.name == "MapBatches(<lambda>)"
     assert physical_op.name == "ReadParquet->MapBatches(<lambda>)"
@@ -588,27 +595,19 @@ def test_read_map_batches_operator_fusion(ray_start_regular_shared_2_cpus):
     input = physical_op.input_dependencies[0]
     assert isinstance(input, InputDataBuffer)
     assert physical_op in input.output_dependencies, input.output_dependencies
-    assert (
-        physical_op.actual_target_max_block_size
-        == DataContext.get_current().target_max_block_size
-    )
+    assert physical_op.actual_target_max_block_size == ctx.target_max_block_size
     assert physical_op._logical_operators == [read_op, op]
 
 
-def test_read_map_chain_operator_fusion(ray_start_regular_shared_2_cpus):
-    ctx = DataContext.get_current()
-
+def test_read_map_chain_operator_fusion(ray_start_regular_shared_2_cpus, planner, ctx):
     # Test that a chain of different map operators are fused.
-    planner = Planner()
     read_op = get_parquet_read_logical_op(parallelism=1)
     map1 = MapRows(read_op, lambda x: x)
     map2 = MapBatches(map1, lambda x: x)
     map3 = FlatMap(map2, lambda x: x)
     map4 = Filter(map3, lambda x: x)
     logical_plan = LogicalPlan(map4, ctx)
-    physical_plan = planner.plan(logical_plan)
-    physical_plan = PhysicalOptimizer().optimize(physical_plan)
-    physical_op = physical_plan.dag
+    physical_op = _plan_and_optimize(planner, logical_plan)
 
     assert map4.name == "Filter(<lambda>)"
     assert (
@@ -618,126 +617,107 @@ def test_read_map_chain_operator_fusion(ray_start_regular_shared_2_cpus):
     assert isinstance(physical_op, MapOperator)
     assert len(physical_op.input_dependencies) == 1
     assert isinstance(physical_op.input_dependencies[0], InputDataBuffer)
-    assert (
-        physical_op.actual_target_max_block_size
-        == DataContext.get_current().target_max_block_size
-    )
+    assert physical_op.actual_target_max_block_size == ctx.target_max_block_size
     assert physical_op._logical_operators == [read_op, map1, map2, map3, map4]
 
 
+# Pairs of (upstream, downstream) remote args with which map operators are still
+# fused.
+COMPATIBLE_ARGS = (
+    # Empty remote args are compatible.
+    ({}, {}),
+    # Test `num_cpus` and `num_gpus`.
+    ({"num_cpus": 2}, {"num_cpus": 2}),
+    ({"num_gpus": 2}, {"num_gpus": 2}),
+    # `num_cpus` defaults to 1, `num_gpus` defaults to 0.
+    # The following 2 should be compatible.
+    ({"num_cpus": 1}, {}),
+    ({}, {"num_gpus": 0}),
+    # Test specifying custom resources.
+    ({"resources": {"custom": 1}}, {"resources": {"custom": 1}}),
+    ({"resources": {"custom": 0}}, {"resources": {}}),
+    # If the downstream op doesn't have `scheduling_strategy`, it will
+    # inherit from the upstream op.
+    ({"scheduling_strategy": "SPREAD"}, {}),
+)
+
+# Pairs of (upstream, downstream) remote args with which map operators won't get
+# fused.
+INCOMPATIBLE_ARGS = (
+    # Use different resources.
+    ({"num_cpus": 2}, {"num_gpus": 2}),
+    # Same resource, but different values.
+    ({"num_cpus": 3}, {"num_cpus": 2}),
+    # Incompatible custom resources.
+    ({"resources": {"custom": 2}}, {"resources": {"custom": 1}}),
+    ({"resources": {"custom1": 1}}, {"resources": {"custom2": 1}}),
+    # Different scheduling strategies.
+    ({"scheduling_strategy": "SPREAD"}, {"scheduling_strategy": "PACK"}),
+)
+
+
+@pytest.mark.parametrize("up_remote_args,down_remote_args", COMPATIBLE_ARGS)
 def test_read_map_batches_operator_fusion_compatible_remote_args(
     ray_start_regular_shared_2_cpus,
+    ctx,
+    planner,
+    up_remote_args,
+    down_remote_args,
 ):
-    ctx = DataContext.get_current()
-
     # Test that map operators are stilled fused when remote args are compatible.
-    compatiple_remote_args_pairs = [
-        # Empty remote args are compatible.
-        ({}, {}),
-        # Test `num_cpus` and `num_gpus`.
-        ({"num_cpus": 2}, {"num_cpus": 2}),
-        ({"num_gpus": 2}, {"num_gpus": 2}),
-        # `num_cpus` defaults to 1, `num_gpus` defaults to 0.
-        # The following 2 should be compatible.
-        ({"num_cpus": 1}, {}),
-        ({}, {"num_gpus": 0}),
-        # Test specifying custom resources.
-        ({"resources": {"custom": 1}}, {"resources": {"custom": 1}}),
-        ({"resources": {"custom": 0}}, {"resources": {}}),
-        # If the downstream op doesn't have `scheduling_strategy`, it will
-        # inherit from the upstream op.
-        ({"scheduling_strategy": "SPREAD"}, {}),
-    ]
-    for up_remote_args, down_remote_args in compatiple_remote_args_pairs:
-        planner = Planner()
-        read_op = get_parquet_read_logical_op(
-            ray_remote_args={"resources": {"non-existent": 1}},
-            parallelism=1,
-        )
-        op = MapBatches(read_op, lambda x: x, ray_remote_args=up_remote_args)
-        op = MapBatches(op, lambda x: x, ray_remote_args=down_remote_args)
-        logical_plan = LogicalPlan(op, ctx)
-
-        physical_plan = planner.plan(logical_plan)
-        optimized_physical_plan = PhysicalOptimizer().optimize(physical_plan)
-        physical_op = optimized_physical_plan.dag
-
-        assert op.name == "MapBatches(<lambda>)", (up_remote_args, down_remote_args)
-        assert physical_op.name == "MapBatches(<lambda>)->MapBatches(<lambda>)", (
-            up_remote_args,
-            down_remote_args,
-        )
-        assert isinstance(physical_op, MapOperator), (up_remote_args, down_remote_args)
-        assert len(physical_op.input_dependencies) == 1, (
-            up_remote_args,
-            down_remote_args,
-        )
-        assert physical_op.input_dependencies[0].name == "ReadParquet", (
-            up_remote_args,
-            down_remote_args,
-        )
+    read_op = get_parquet_read_logical_op(
+        ray_remote_args={"resources": {"non-existent": 1}},
+        parallelism=1,
+    )
+    op = MapBatches(read_op, lambda x: x, ray_remote_args=up_remote_args)
+    op = MapBatches(op, lambda x: x, ray_remote_args=down_remote_args)
+    logical_plan = LogicalPlan(op, ctx)
+
+    physical_op = _plan_and_optimize(planner, logical_plan)
+
+    assert op.name == "MapBatches(<lambda>)"
+    assert physical_op.name == "MapBatches(<lambda>)->MapBatches(<lambda>)"
+    assert isinstance(physical_op, MapOperator)
+    assert len(physical_op.input_dependencies) == 1
+    assert physical_op.input_dependencies[0].name == "ReadParquet"
 
 
+@pytest.mark.parametrize("up_remote_args,down_remote_args", INCOMPATIBLE_ARGS)
 def test_read_map_batches_operator_fusion_incompatible_remote_args(
     ray_start_regular_shared_2_cpus,
+    ctx,
+    planner,
+    up_remote_args,
+    down_remote_args,
 ):
-    ctx = DataContext.get_current()
-
     # Test that map operators won't get fused if the remote args are incompatible.
-    incompatible_remote_args_pairs = [
-        # Use different resources.
-        ({"num_cpus": 2}, {"num_gpus": 2}),
-        # Same resource, but different values.
-        ({"num_cpus": 3}, {"num_cpus": 2}),
-        # Incompatible custom resources.
-        ({"resources": {"custom": 2}}, {"resources": {"custom": 1}}),
-        ({"resources": {"custom1": 1}}, {"resources": {"custom2": 1}}),
-        # Different scheduling strategies.
-        ({"scheduling_strategy": "SPREAD"}, {"scheduling_strategy": "PACK"}),
-    ]
-    for up_remote_args, down_remote_args in incompatible_remote_args_pairs:
-        planner = Planner()
-        read_op = get_parquet_read_logical_op(
-            ray_remote_args={"resources": {"non-existent": 1}}
-        )
-        op = MapBatches(read_op, lambda x: x, ray_remote_args=up_remote_args)
-        op = MapBatches(op, lambda x: x, ray_remote_args=down_remote_args)
-        logical_plan = LogicalPlan(op, ctx)
-        physical_plan = planner.plan(logical_plan)
-        physical_plan = PhysicalOptimizer().optimize(physical_plan)
-        physical_op = physical_plan.dag
-
-        assert op.name == "MapBatches(<lambda>)", (up_remote_args, down_remote_args)
-        assert physical_op.name == "MapBatches(<lambda>)", (
-            up_remote_args,
-            down_remote_args,
-        )
-        assert isinstance(physical_op, MapOperator), (up_remote_args, down_remote_args)
-        assert len(physical_op.input_dependencies) == 1, (
-            up_remote_args,
-            down_remote_args,
-        )
-        assert physical_op.input_dependencies[0].name == "MapBatches(<lambda>)", (
-            up_remote_args,
-            down_remote_args,
-        )
+    read_op = get_parquet_read_logical_op(
+        ray_remote_args={"resources": {"non-existent": 1}}
+    )
+    op = MapBatches(read_op, lambda x: x, ray_remote_args=up_remote_args)
+    op = MapBatches(op, lambda x: x, ray_remote_args=down_remote_args)
+    logical_plan = LogicalPlan(op, ctx)
+    physical_op = _plan_and_optimize(planner, logical_plan)
+
+    assert op.name == "MapBatches(<lambda>)"
+    assert physical_op.name == "MapBatches(<lambda>)"
+    assert isinstance(physical_op, MapOperator)
+    assert len(physical_op.input_dependencies) == 1
+    assert physical_op.input_dependencies[0].name == "MapBatches(<lambda>)"
 
 
 def test_read_map_batches_operator_fusion_compute_tasks_to_actors(
     ray_start_regular_shared_2_cpus,
+    planner,
+    ctx,
 ):
-    ctx = DataContext.get_current()
-
     # Test that a task-based map operator is fused into an actor-based map operator when
     # the former comes before the latter.
-    planner = Planner()
     read_op = get_parquet_read_logical_op(parallelism=1)
     op = MapBatches(read_op, lambda x: x)
     op = MapBatches(op, lambda x: x, compute=ray.data.ActorPoolStrategy())
     logical_plan = LogicalPlan(op, ctx)
-    physical_plan = planner.plan(logical_plan)
-    physical_plan = PhysicalOptimizer().optimize(physical_plan)
-    physical_op = physical_plan.dag
+    physical_op = _plan_and_optimize(planner, logical_plan)
 
     assert op.name == "MapBatches(<lambda>)"
     assert physical_op.name == "ReadParquet->MapBatches(<lambda>)->MapBatches(<lambda>)"
@@ -748,17 +728,14 @@ def test_read_map_batches_operator_fusion_compute_tasks_to_actors(
 
 def test_read_map_batches_operator_fusion_compute_read_to_actors(
     ray_start_regular_shared_2_cpus,
+    planner,
+    ctx,
 ):
-    ctx = DataContext.get_current()
-
     # Test that reads fuse into an actor-based map operator.
-    planner = Planner()
     read_op = get_parquet_read_logical_op(parallelism=1)
     op = MapBatches(read_op, lambda x: x, compute=ray.data.ActorPoolStrategy())
     logical_plan = LogicalPlan(op, ctx)
-    physical_plan = planner.plan(logical_plan)
-    physical_plan = PhysicalOptimizer().optimize(physical_plan)
-    physical_op = physical_plan.dag
+    physical_op = _plan_and_optimize(planner, logical_plan)
 
     assert op.name == "MapBatches(<lambda>)"
     assert physical_op.name == "ReadParquet->MapBatches(<lambda>)"
@@ -769,18 +746,15 @@ def test_read_map_batches_operator_fusion_compute_read_to_actors(
 
 def test_read_map_batches_operator_fusion_incompatible_compute(
     ray_start_regular_shared_2_cpus,
+    planner,
+    ctx,
 ):
-    ctx = DataContext.get_current()
-
     # Test that map operators are not fused when compute strategies are incompatible.
-    planner = Planner()
     read_op = get_parquet_read_logical_op(parallelism=1)
     op = MapBatches(read_op, lambda x: x, compute=ray.data.ActorPoolStrategy())
     op = MapBatches(op, lambda x: x)
     logical_plan = LogicalPlan(op, ctx)
-    physical_plan = planner.plan(logical_plan)
-    physical_plan = PhysicalOptimizer().optimize(physical_plan)
-    physical_op = physical_plan.dag
+    physical_op = _plan_and_optimize(planner, logical_plan)
 
     assert op.name == "MapBatches(<lambda>)"
     assert physical_op.name == "MapBatches(<lambda>)"
@@ -794,20 +768,17 @@ def test_read_map_batches_operator_fusion_incompatible_compute(
 
 def test_read_map_batches_operator_fusion_min_rows_per_bundled_input(
     ray_start_regular_shared_2_cpus,
+    planner,
+    ctx,
 ):
-    ctx = DataContext.get_current()
-
     # Test that fusion of map operators merges their block sizes in the expected way
     # (taking the max).
-    planner = Planner()
     read_op = get_parquet_read_logical_op(parallelism=1)
     op = MapBatches(read_op, lambda x: x, min_rows_per_bundled_input=2)
     op = MapBatches(op, lambda x: x, min_rows_per_bundled_input=5)
     op = MapBatches(op, lambda x: x, min_rows_per_bundled_input=3)
     logical_plan = LogicalPlan(op, ctx)
-    physical_plan = planner.plan(logical_plan)
-    physical_plan = PhysicalOptimizer().optimize(physical_plan)
-    physical_op = physical_plan.dag
+    physical_op = _plan_and_optimize(planner, logical_plan)
 
     assert op.name == "MapBatches(<lambda>)"
     # Ops are still fused.
@@ -821,10 +792,7 @@ def test_read_map_batches_operator_fusion_min_rows_per_bundled_input(
     assert len(physical_op.input_dependencies) == 1
     assert isinstance(physical_op.input_dependencies[0], InputDataBuffer)
 
-    assert (
-        physical_op.actual_target_max_block_size
-        == DataContext.get_current().target_max_block_size
-    )
+    assert physical_op.actual_target_max_block_size == ctx.target_max_block_size
 
 
 def test_read_map_batches_operator_fusion_with_randomize_blocks_operator(
@@ -836,50 +804,57 @@ def test_read_map_batches_operator_fusion_with_randomize_blocks_operator(
     # which collapses RandomizeBlocks operators, so we should not be fusing them
     # to begin with.
     def fn(batch):
-        return {"id": [x + 1 for x in batch["id"]]}
+        return {"id": batch["id"] + 1}
 
     n = 10
     ds = ray.data.range(n)
     ds = ds.randomize_block_order()
     ds = ds.map_batches(fn, batch_size=None)
-    assert set(extract_values("id", ds.take_all())) == set(range(1, n + 1))
-    assert "ReadRange->MapBatches(fn)->RandomizeBlockOrder" not in ds.stats()
-    assert "ReadRange->MapBatches(fn)" in ds.stats()
+    _assert_id_counts(ds, range(1, n + 1))
+    stats = ds.stats()
+    assert "ReadRange->MapBatches(fn)->RandomizeBlockOrder" not in stats
+    assert "ReadRange->MapBatches(fn)" in stats
     _check_usage_record(["ReadRange", "MapBatches", "RandomizeBlockOrder"])
 
 
+@_with_single_shuffle_strategy
 def test_read_map_batches_operator_fusion_with_random_shuffle_operator(
-    ray_start_regular_shared_2_cpus, configure_shuffle_method
+    ray_start_regular_shared_2_cpus,
+    configure_shuffle_method,
+    planner,
+    restore_data_context,
 ):
     # Note: we currently only support fusing MapOperator->AllToAllOperator.
     def fn(batch):
-        return {"id": [x + 1 for x in batch["id"]]}
+        return {"id": batch["id"] + 1}
 
     n = 10
     ds = ray.data.range(n)
     ds = ds.map_batches(fn, batch_size=None)
     ds = ds.random_shuffle()
-    assert set(extract_values("id", ds.take_all())) == set(range(1, n + 1))
+    _assert_id_counts(ds, range(1, n + 1))
     assert "ReadRange->MapBatches(fn)->RandomShuffle" in ds.stats()
     _check_usage_record(["ReadRange", "MapBatches", "RandomShuffle"])
 
     ds = ray.data.range(n)
     ds = ds.random_shuffle()
     ds = ds.map_batches(fn, batch_size=None)
-    assert set(extract_values("id", ds.take_all())) == set(range(1, n + 1))
+    _assert_id_counts(ds, range(1, n + 1))
     # TODO(Scott): Update below assertion after supporting fusion in
     # the other direction (AllToAllOperator->MapOperator)
-    assert "ReadRange->RandomShuffle->MapBatches(fn)" not in ds.stats()
-    assert all(op in ds.stats() for op in ("ReadRange", "RandomShuffle", "MapBatches"))
+    stats = ds.stats()
+    assert "ReadRange->RandomShuffle->MapBatches(fn)" not in stats
+    assert all(op in stats for op in ("ReadRange", "RandomShuffle", "MapBatches"))
     _check_usage_record(["ReadRange", "RandomShuffle", "MapBatches"])
 
     # Test fusing multiple `map_batches` with multiple `random_shuffle` operations.
+    # Fused execution is already covered above, so only check the fused plan.
     ds = ray.data.range(n)
     for _ in range(5):
         ds = ds.map_batches(fn, batch_size=None)
     ds = ds.random_shuffle()
-    assert set(extract_values("id", ds.take_all())) == set(range(5, n + 5))
-    assert f"ReadRange->{'MapBatches(fn)->' * 5}RandomShuffle" in ds.stats()
+    physical_op = _plan_and_optimize(planner, ds._plan._logical_plan)
+    assert physical_op.name == f"ReadRange->{'MapBatches(fn)->' * 5}RandomShuffle"
 
     # For interweaved map_batches and random_shuffle operations, we expect to fuse the
     # two pairs of MapBatches->RandomShuffle, but not the resulting
@@ -889,49 +864,59 @@ def test_read_map_batches_operator_fusion_with_random_shuffle_operator(
     ds = ds.random_shuffle()
     ds = ds.map_batches(fn, batch_size=None)
     ds = ds.random_shuffle()
-    assert set(extract_values("id", ds.take_all())) == set(range(2, n + 2))
-    assert "Operator 1 ReadRange->MapBatches(fn)->RandomShuffle" in ds.stats()
-    assert "Operator 2 MapBatches(fn)->RandomShuffle" in ds.stats()
+    _assert_id_counts(ds, range(2, n + 2))
+    stats = ds.stats()
+    assert "Operator 1 ReadRange->MapBatches(fn)->RandomShuffle" in stats
+    assert "Operator 2 MapBatches(fn)->RandomShuffle" in stats
     _check_usage_record(["ReadRange", "RandomShuffle", "MapBatches"])
 
     # Check the case where the upstream map function returns multiple blocks.
-    ctx = ray.data.DataContext.get_current()
-    old_target_max_block_size = ctx.target_max_block_size
-    ctx.target_max_block_size = 100
+    # Each output row (128 bytes) exceeds the target block size, so every map task
+    # emits one block per row.
+    ray.data.DataContext.get_current().target_max_block_size = 100
 
-    def fn(_):
-        return {"data": np.zeros((100, 100))}
+    # Every row maps to the same read-only array, so it's only allocated once.
+    data = np.zeros((4, 4))
+    data.flags.writeable = False
 
-    ds = ray.data.range(10)
-    ds = ds.repartition(2).map(fn).random_shuffle().materialize()
-    assert "Operator 1 ReadRange" in ds.stats()
-    assert "Operator 2 Repartition" in ds.stats()
-    assert "Operator 3 Map(fn)->RandomShuffle" in ds.stats()
+    def fn(_):
+        return {"data": data}
+
+    ds = ray.data.range(4)
+    ds = ds.repartition(2).map(fn).random_shuffle()
+    physical_op = _plan_and_optimize(planner, ds._plan._logical_plan)
+    assert physical_op.name == "Map(fn)->RandomShuffle"
+    ds = ds.materialize()
+    assert ds.count() == 4
+    stats = ds.stats()
+    assert "Operator 1 ReadRange" in stats
+    assert "Operator 2 Repartition" in stats
+    assert "Operator 3 Map(fn)->RandomShuffle" in stats
     _check_usage_record(["ReadRange", "RandomShuffle", "Map"])
 
-    ctx.target_max_block_size = old_target_max_block_size
-
 
+@_with_single_shuffle_strategy
 @pytest.mark.parametrize("shuffle", (True, False))
 def test_read_map_batches_operator_fusion_with_repartition_operator(
     ray_start_regular_shared_2_cpus, shuffle, configure_shuffle_method
 ):
     def fn(batch):
-        return {"id": [x + 1 for x in batch["id"]]}
+        return {"id": batch["id"] + 1}
 
     n = 10
     ds = ray.data.range(n)
     ds = ds.map_batches(fn, batch_size=None)
     ds = ds.repartition(2, shuffle=shuffle)
-    assert set(extract_values("id", ds.take_all())) == set(range(1, n + 1))
+    _assert_id_counts(ds, range(1, n + 1))
 
     # Operator fusion is only supported for shuffle repartition.
     if shuffle:
         assert "ReadRange->MapBatches(fn)->Repartition" in ds.stats()
     else:
-        assert "ReadRange->MapBatches(fn)->Repartition" not in ds.stats()
-        assert "ReadRange->MapBatches(fn)" in ds.stats()
-        assert "Repartition" in ds.stats()
+        stats = ds.stats()
+        assert "ReadRange->MapBatches(fn)->Repartition" not in stats
+        assert "ReadRange->MapBatches(fn)" in stats
+        assert "Repartition" in stats
     _check_usage_record(["ReadRange", "MapBatches", "Repartition"])
 
 
@@ -942,7 +927,7 @@ def test_read_map_batches_operator_fusion_with_sort_operator(
     # This test is to ensure that we don't accidentally fuse them, until
     # we implement it later.
     def fn(batch):
-        return {"id": [x + 1 for x in batch["id"]]}
+        return {"id": batch["id"] + 1}
 
     n = 10
     ds = ray.data.range(n)
@@ -950,12 +935,14 @@ def test_read_map_batches_operator_fusion_with_sort_operator(
     ds = ds.sort("id")
     assert extract_values("id", ds.take_all()) == list(range(1, n + 1))
     # TODO(Scott): update the below assertions after we support fusion.
-    assert "ReadRange->MapBatches->Sort" not in ds.stats()
-    assert "ReadRange->MapBatches" in ds.stats()
-    assert "Sort" in ds.stats()
+    stats = ds.stats()
+    assert "ReadRange->MapBatches->Sort" not in stats
+    assert "ReadRange->MapBatches" in stats
+    assert "Sort" in stats
     _check_usage_record(["ReadRange", "MapBatches", "Sort"])
 
 
+@_with_single_shuffle_strategy
 def test_read_map_batches_operator_fusion_with_aggregate_operator(
     ray_start_regular_shared_2_cpus, configure_shuffle_method
 ):
@@ -965,7 +952,7 @@ def test_read_map_batches_operator_fusion_with_aggregate_operator(
     # This test is to ensure that we don't accidentally fuse them, until
     # we implement it later.
     def fn(batch):
-        return {"id": [x % 2 for x in batch["id"]]}
+        return {"id": batch["id"] % 2}
 
     n = 100
     grouped_ds = ray.data.range(n).map_batches(fn, batch_size=None).groupby("id")
@@ -980,9 +967,10 @@ def test_read_map_batches_operator_fusion_with_aggregate_operator(
     )
     agg_ds.take_all() == [{"id": 0, "foo": 0.0}, {"id": 1, "foo": 1.0}]
     # TODO(Scott): update the below assertions after we support fusion.
-    assert "ReadRange->MapBatches->Aggregate" not in agg_ds.stats()
-    assert "ReadRange->MapBatches" in agg_ds.stats()
-    assert "Aggregate" in agg_ds.stats()
+    stats = agg_ds.stats()
+    assert "ReadRange->MapBatches->Aggregate" not in stats
+    assert "ReadRange->MapBatches" in stats
+    assert "Aggregate" in stats
     _check_usage_record(["ReadRange", "MapBatches", "Aggregate"])
 
 
@@ -992,9 +980,7 @@ def test_read_map_chain_operator_fusion_e2e(
     ds = ray.data.range(10, override_num_blocks=2)
     ds = ds.filter(lambda x: x["id"] % 2 == 0)
     ds = ds.map(column_udf("id", lambda x: x + 1))
-    ds = ds.map_batches(
-        lambda batch: {"id": [2 * x for x in batch["id"]]}, batch_size=None
-    )
+    ds = ds.map_batches(lambda batch: {"id": 2 * batch["id"]}, batch_size=None)
     ds = ds.flat_map(lambda x: [{"id": -x["id"]}, {"id": x["id"]}])
     assert extract_values("id", ds.take_all()) == [
         -2,
@@ -1023,6 +1009,31 @@ def test_write_fusion(ray_start_regular_shared_2_cpus, tmp_path):
     _check_usage_record(["ReadRange", "WriteCSV"])
 
 
+def _build_concurrency_fusion_ds(
+    up_use_actor, up_concurrency, down_use_actor, down_concurrency
+):
+    """Build a dataset with two maps and return it along with the name that the
+    two maps have when fused."""
+
+    class Map:
+        def __call__(self, row):
+            return row
+
+    def map(row):
+        return row
+
+    ds = ray.data.range(10, override_num_blocks=2)
+    names = []
+    for use_actor, concurrency in [
+        (up_use_actor, up_concurrency),
+        (down_use_actor, down_concurrency),
+    ]:
+        fn = Map if use_actor else map
+        ds = ds.map(fn, num_cpus=0, concurrency=concurrency)
+        names.append(f"Map({fn.__name__})")
+    return ds, "->".join(names)
+
+
 @pytest.mark.parametrize(
     "up_use_actor, up_concurrency, down_use_actor, down_concurrency, should_fuse",
     [
@@ -1054,6 +1065,7 @@ def test_write_fusion(ray_start_regular_shared_2_cpus, tmp_path):
 )
 def test_map_fusion_with_concurrency_arg(
     ray_start_regular_shared_2_cpus,
+    planner,
     up_use_actor,
     up_concurrency,
     down_use_actor,
@@ -1061,44 +1073,25 @@ def test_map_fusion_with_concurrency_arg(
     should_fuse,
 ):
     """Test map operator fusion with different concurrency settings."""
-
-    class Map:
-        def __call__(self, row):
-            return row
-
-    def map(row):
-        return row
-
-    ds = ray.data.range(10, override_num_blocks=2)
-    if not up_use_actor:
-        ds = ds.map(map, num_cpus=0, concurrency=up_concurrency)
-        up_name = "Map(map)"
+    ds, name = _build_concurrency_fusion_ds(
+        up_use_actor, up_concurrency, down_use_actor, down_concurrency
+    )
+    # Fusion is decided at planning time, so there's no need to execute the dataset.
+    physical_op = _plan_and_optimize(planner, ds._plan._logical_plan)
+    if should_fuse:
+        assert name in physical_op.name, physical_op.name
     else:
-        ds = ds.map(Map, num_cpus=0, concurrency=up_concurrency)
-        up_name = "Map(Map)"
+        assert name not in physical_op.name, physical_op.name
 
-    if not down_use_actor:
-        ds = ds.map(map, num_cpus=0, concurrency=down_concurrency)
-        down_name = "Map(map)"
-    else:
-        ds = ds.map(Map, num_cpus=0, concurrency=down_concurrency)
-        down_name = "Map(Map)"
 
+def test_map_fusion_with_concurrency_arg_e2e(ray_start_regular_shared_2_cpus):
+    ds, name = _build_concurrency_fusion_ds(False, 1, False, 1)
     assert extract_values("id", ds.take_all()) == list(range(10))
+    assert name in ds.stats()
 
-    name = f"{up_name}->{down_name}"
-    stats = ds.stats()
-    if should_fuse:
-        assert name in stats, stats
-    else:
-        assert name not in stats, stats
-
-
-def test_write_operator(ray_start_regular_shared_2_cpus, tmp_path):
-    ctx = DataContext.get_current()
 
+def test_write_operator(ray_start_regular_shared_2_cpus, tmp_path, ctx, planner):
     concurrency = 2
-    planner = Planner()
     datasink = ParquetDatasink(tmp_path)
     read_op = get_parquet_read_logical_op()
     op = Write(
@@ -1119,12 +1112,7 @@ def test_write_operator(ray_start_regular_shared_2_cpus, tmp_path):
     assert physical_op._logical_operators == [op]
 
 
-def test_sort_operator(
-    ray_start_regular_shared_2_cpus,
-):
-    ctx = DataContext.get_current()
-
-    planner = Planner()
+def test_sort_operator(ray_start_regular_shared_2_cpus, ctx, planner):
     read_op = get_parquet_read_logical_op()
     op = Sort(
         read_op,
@@ -1137,13 +1125,10 @@ def test_sort_operator(
     assert isinstance(physical_op, AllToAllOperator)
     assert len(physical_op.input_dependencies) == 1
     assert isinstance(physical_op.input_dependencies[0], MapOperator)
-    assert (
-        physical_op.actual_target_max_block_size
-        == DataContext.get_current().target_shuffle_max_block_size
-    )
+    assert physical_op.actual_target_max_block_size == ctx.target_shuffle_max_block_size
 
 
-def test_sort_e2e(ray_start_regular_shared_2_cpus, configure_shuffle_method, tmp_path):
+def test_sort_e2e(ray_start_regular_shared_2_cpus, configure_shuffle_method):
     ds = ray.data.range(100, override_num_blocks=4)
     ds = ds.random_shuffle()
     ds = ds.sort("id")
@@ -1152,9 +1137,6 @@ def test_sort_e2e(ray_start_regular_shared_2_cpus, configure_shuffle_method, tmp
 
     df = pd.DataFrame({"one": list(range(100)), "two": ["a"] * 100})
     ds = ray.data.from_pandas([df])
-    ds.write_parquet(tmp_path)
-
-    ds = ray.data.read_parquet(tmp_path)
     ds = ds.random_shuffle()
     ds1 = ds.sort("one")
     ds2 = ds.sort("one", descending=True)
@@ -1165,7 +1147,7 @@ def test_sort_e2e(ray_start_regular_shared_2_cpus, configure_shuffle_method, tmp
 
 
 def test_sort_validate_keys(ray_start_regular_shared_2_cpus):
-    ds = ray.data.range(10)
+    ds = _range(10)
     assert extract_values("id", ds.sort("id").take_all()) == list(range(10))
 
     invalid_col_name = "invalid_column"
@@ -1260,10 +1242,7 @@ def test_batch_format_on_aggregate(ray_start_regular_shared_2_cpus):
     ) == {"prod": 384}
 
 
-def test_aggregate_operator(ray_start_regular_shared_2_cpus):
-    ctx = DataContext.get_current()
-
-    planner = Planner()
+def test_aggregate_operator(ray_start_regular_shared_2_cpus, ctx, planner):
     read_op = get_parquet_read_logical_op()
     op = Aggregate(
         read_op,
@@ -1277,10 +1256,7 @@ def test_aggregate_operator(ray_start_regular_shared_2_cpus):
     assert isinstance(physical_op, AllToAllOperator)
     assert len(physical_op.input_dependencies) == 1
     assert isinstance(physical_op.input_dependencies[0], MapOperator)
-    assert (
-        physical_op.actual_target_max_block_size
-        == DataContext.get_current().target_shuffle_max_block_size
-    )
+    assert physical_op.actual_target_max_block_size == ctx.target_shuffle_max_block_size
 
     # Check that the linked logical operator is the same the input op.
     assert physical_op._logical_operators == [op]
@@ -1289,14 +1265,14 @@ def test_aggregate_operator(ray_start_regular_shared_2_cpus):
 def test_aggregate_e2e(ray_start_regular_shared_2_cpus, configure_shuffle_method):
     ds = ray.data.range(100, override_num_blocks=4)
     ds = ds.groupby("id").count()
-    assert ds.count() == 100
-    for idx, row in enumerate(ds.sort("id").iter_rows()):
-        assert row == {"id": idx, "count()": 1}
+    # Order the rows locally rather than adding a distributed sort to the plan.
+    rows = sorted(ds.take_all(), key=lambda row: row["id"])
+    assert rows == [{"id": i, "count()": 1} for i in range(100)]
     _check_usage_record(["ReadRange", "Aggregate"])
 
 
 def test_aggregate_validate_keys(ray_start_regular_shared_2_cpus):
-    ds = ray.data.range(10)
+    ds = _range(10)
     invalid_col_name = "invalid_column"
     with pytest.raises(ValueError):
         ds.groupby(invalid_col_name).count()
@@ -1330,10 +1306,7 @@ def test_aggregate_validate_keys(ray_start_regular_shared_2_cpus):
         ds_named.groupby(invalid_col_name).count()
 
 
-def test_zip_operator(ray_start_regular_shared_2_cpus):
-    ctx = DataContext.get_current()
-
-    planner = Planner()
+def test_zip_operator(ray_start_regular_shared_2_cpus, ctx, planner):
     read_op1 = get_parquet_read_logical_op()
     read_op2 = get_parquet_read_logical_op()
     op = Zip(read_op1, read_op2)
@@ -1346,18 +1319,17 @@ def test_zip_operator(ray_start_regular_shared_2_cpus):
     assert isinstance(physical_op.input_dependencies[0], MapOperator)
     assert isinstance(physical_op.input_dependencies[1], MapOperator)
 
-    assert (
-        physical_op.actual_target_max_block_size
-        == DataContext.get_current().target_max_block_size
-    )
+    assert physical_op.actual_target_max_block_size == ctx.target_max_block_size
 
     # Check that the linked logical operator is the same the input op.
     assert physical_op._logical_operators == [op]
 
 
+# Edge, equal, and coprime block counts cover the distinct block-alignment paths
+# without enumerating every pair.
 @pytest.mark.parametrize(
     "num_blocks1,num_blocks2",
-    list(itertools.combinations_with_replacement(range(1, 12), 2)),
+    [(1, 1), (1, 11), (11, 1), (2, 3), (3, 2), (4, 4), (7, 11)],
 )
 def test_zip_e2e(ray_start_regular_shared_2_cpus, num_blocks1, num_blocks2):
     n = 12
@@ -1411,42 +1383,41 @@ def test_from_modin_e2e(ray_start_regular_shared_2_cpus):
 
 
 @pytest.mark.parametrize("enable_pandas_block", [False, True])
-def test_from_pandas_refs_e2e(ray_start_regular_shared_2_cpus, enable_pandas_block):
-    ctx = ray.data.context.DataContext.get_current()
-    old_enable_pandas_block = ctx.enable_pandas_block
-    ctx.enable_pandas_block = enable_pandas_block
-
-    try:
-        df1 = pd.DataFrame({"one": [1, 2, 3], "two": ["a", "b", "c"]})
-        df2 = pd.DataFrame({"one": [4, 5, 6], "two": ["e", "f", "g"]})
-
-        ds = ray.data.from_pandas_refs([ray.put(df1), ray.put(df2)])
-        values = [(r["one"], r["two"]) for r in ds.take(6)]
-        rows = [(r.one, r.two) for _, r in pd.concat([df1, df2]).iterrows()]
-        assert values == rows
-        # Check that metadata fetch is included in stats.
-        assert "FromPandas" in ds.stats()
-        assert ds._plan._logical_plan.dag.name == "FromPandas"
-
-        # Test chaining multiple operations
-        ds2 = ds.map_batches(lambda x: x)
-        values = [(r["one"], r["two"]) for r in ds2.take(6)]
-        assert values == rows
-        assert "MapBatches" in ds2.stats()
-        assert "FromPandas" in ds2.stats()
-        assert ds2._plan._logical_plan.dag.name == "MapBatches(<lambda>)"
-
-        # test from single pandas dataframe
-        ds = ray.data.from_pandas_refs(ray.put(df1))
-        values = [(r["one"], r["two"]) for r in ds.take(3)]
-        rows = [(r.one, r.two) for _, r in df1.iterrows()]
-        assert values == rows
-        # Check that metadata fetch is included in stats.
-        assert "FromPandas" in ds.stats()
-        assert ds._plan._logical_plan.dag.name == "FromPandas"
-        _check_usage_record(["FromPandas"])
-    finally:
-        ctx.enable_pandas_block = old_enable_pandas_block
+def test_from_pandas_refs_e2e(
+    ray_start_regular_shared_2_cpus, restore_data_context, enable_pandas_block
+):
+    ray.data.context.DataContext.get_current().enable_pandas_block = enable_pandas_block
+
+    df1 = pd.DataFrame({"one": [1, 2, 3], "two": ["a", "b", "c"]})
+    df2 = pd.DataFrame({"one": [4, 5, 6], "two": ["e", "f", "g"]})
+
+    refs = [ray.put(df1), ray.put(df2)]
+    ds = ray.data.from_pandas_refs(refs)
+    values = [(r["one"], r["two"]) for r in ds.take(6)]
+    rows = list(pd.concat([df1, df2]).itertuples(index=False, name=None))
+    assert values == rows
+    # Check that metadata fetch is included in stats.
+    assert "FromPandas" in ds.stats()
+    assert ds._plan._logical_plan.dag.name == "FromPandas"
+
+    # Test chaining multiple operations
+    ds2 = ds.map_batches(lambda x: x)
+    values = [(r["one"], r["two"]) for r in ds2.take(6)]
+    assert values == rows
+    stats = ds2.stats()
+    assert "MapBatches" in stats
+    assert "FromPandas" in stats
+    assert ds2._plan._logical_plan.dag.name == "MapBatches(<lambda>)"
+
+    # test from single pandas dataframe
+    ds = ray.data.from_pandas_refs(refs[0])
+    values = [(r["one"], r["two"]) for r in ds.take(3)]
+    rows = list(df1.itertuples(index=False, name=None))
+    assert values == rows
+    # Check that metadata fetch is included in stats.
+    assert "FromPandas" in ds.stats()
+    assert ds._plan._logical_plan.dag.name == "FromPandas"
+    _check_usage_record(["FromPandas"])
 
 
 def test_from_numpy_refs_e2e(ray_start_regular_shared_2_cpus):
@@ -1455,8 +1426,9 @@ def test_from_numpy_refs_e2e(ray_start_regular_shared_2_cpus):
     arr1 = np.expand_dims(np.arange(0, 4), axis=1)
     arr2 = np.expand_dims(np.arange(4, 8), axis=1)
 
-    ds = ray.data.from_numpy_refs([ray.put(arr1), ray.put(arr2)])
-    values = np.stack(extract_values("data", ds.take(8)))
+    refs = [ray.put(arr1), ray.put(arr2)]
+    ds = ray.data.from_numpy_refs(refs)
+    values = ds.take_batch(8, batch_format="numpy")["data"]
     np.testing.assert_array_equal(values, np.concatenate((arr1, arr2)))
     # Check that conversion task is included in stats.
     assert "FromNumpy" in ds.stats()
@@ -1465,16 +1437,17 @@ def test_from_numpy_refs_e2e(ray_start_regular_shared_2_cpus):
 
     # Test chaining multiple operations
     ds2 = ds.map_batches(lambda x: x)
-    values = np.stack(extract_values("data", ds2.take(8)))
+    values = ds2.take_batch(8, batch_format="numpy")["data"]
     np.testing.assert_array_equal(values, np.concatenate((arr1, arr2)))
-    assert "MapBatches" in ds2.stats()
-    assert "FromNumpy" in ds2.stats()
+    stats = ds2.stats()
+    assert "MapBatches" in stats
+    assert "FromNumpy" in stats
     assert ds2._plan._logical_plan.dag.name == "MapBatches(<lambda>)"
     _check_usage_record(["FromNumpy", "MapBatches"])
 
     # Test from single NumPy ndarray.
-    ds = ray.data.from_numpy_refs(ray.put(arr1))
-    values = np.stack(extract_values("data", ds.take(4)))
+    ds = ray.data.from_numpy_refs(refs[0])
+    values = ds.take_batch(4, batch_format="numpy")["data"]
     np.testing.assert_array_equal(values, arr1)
     # Check that conversion task is included in stats.
     assert "FromNumpy" in ds.stats()
@@ -1487,12 +1460,11 @@ def test_from_arrow_refs_e2e(ray_start_regular_shared_2_cpus):
 
     df1 = pd.DataFrame({"one": [1, 2, 3], "two": ["a", "b", "c"]})
     df2 = pd.DataFrame({"one": [4, 5, 6], "two": ["e", "f", "g"]})
-    ds = ray.data.from_arrow_refs(
-        [ray.put(pa.Table.from_pandas(df1)), ray.put(pa.Table.from_pandas(df2))]
-    )
+    refs = [ray.put(pa.Table.from_pandas(df1)), ray.put(pa.Table.from_pandas(df2))]
+    ds = ray.data.from_arrow_refs(refs)
 
     values = [(r["one"], r["two"]) for r in ds.take(6)]
-    rows = [(r.one, r.two) for _, r in pd.concat([df1, df2]).iterrows()]
+    rows = list(pd.concat([df1, df2]).itertuples(index=False, name=None))
     assert values == rows
     # Check that metadata fetch is included in stats.
     assert "FromArrow" in ds.stats()
@@ -1500,9 +1472,9 @@ def test_from_arrow_refs_e2e(ray_start_regular_shared_2_cpus):
     _check_usage_record(["FromArrow"])
 
     # test from single pyarrow table ref
-    ds = ray.data.from_arrow_refs(ray.put(pa.Table.from_pandas(df1)))
+    ds = ray.data.from_arrow_refs(refs[0])
     values = [(r["one"], r["two"]) for r in ds.take(3)]
-    rows = [(r.one, r.two) for _, r in df1.iterrows()]
+    rows = list(df1.itertuples(index=False, name=None))
     assert values == rows
     # Check that conversion task is included in stats.
     assert "FromArrow" in ds.stats()
@@ -1531,7 +1503,8 @@ def test_from_huggingface_e2e(ray_start_regular_shared_2_cpus):
         # Check that metadata fetch is included in stats;
         # the underlying implementation uses the `ReadParquet` operator
         # as this is an un-transformed public dataset.
-        assert "ReadParquet" in ds.stats() or "FromArrow" in ds.stats()
+        stats = ds.stats()
+        assert "ReadParquet" in stats or "FromArrow" in stats
         assert (
             ds._plan._logical_plan.dag.name == "ReadParquet"
             or ds._plan._logical_plan.dag.name == "FromArrow"
@@ -1588,10 +1561,10 @@ def test_from_tf_e2e(ray_start_regular_shared_2_cpus):
     _check_usage_record(["FromItems"])
 
 
-def test_from_torch_e2e(ray_start_regular_shared_2_cpus, tmp_path):
+def test_from_torch_e2e(ray_start_regular_shared_2_cpus, fashion_mnist_root):
     import torchvision
 
-    torch_dataset = torchvision.datasets.FashionMNIST(tmp_path, download=True)
+    torch_dataset = torchvision.datasets.FashionMNIST(fashion_mnist_root)
 
     ray_dataset = ray.data.from_torch(torch_dataset)
 
@@ -1691,15 +1664,128 @@ def test_limit_pushdown(ray_start_regular_shared_2_cpus):
     )
 
 
+def test_limit_fusion(ray_start_regular_shared_2_cpus):
+    ds = ray.data.range(100).limit(50).limit(80).limit(5).limit(20)
+    optimized_plan = LogicalOptimizer().optimize(ds._plan._logical_plan)
+    assert optimized_plan.dag.dag_str == "Read[ReadRange] -> Limit[limit=5]"
+    assert extract_values("id", ds.take_all()) == list(range(5))
+    # Only the fused Limit operator is executed.
+    stats = ds.stats()
+    assert "limit=5" in stats
+    assert all(f"limit={n}" not in stats for n in (20, 50, 80))
+
+    # Limit operators that aren't back-to-back are left as is.
+    ds = ray.data.range(100).limit(20).map(column_udf("id", lambda x: x)).limit(5)
+    optimized_plan = LogicalOptimizer().optimize(ds._plan._logical_plan)
+    assert optimized_plan.dag.dag_str == (
+        "Read[ReadRange] -> Limit[limit=20] -> MapRows[Map(<lambda>)] -> "
+        "Limit[limit=5]"
+    )
+
+    # Only the inputs that are fused Limit operators are replaced in an operator
+    # with multiple inputs.
+    limited = ray.data.range(10).limit(5)
+    ds = limited.limit(3).zip(ray.data.range(3).rename_columns({"id": "other"}))
+    assert ds.take_all() == [{"id": i, "other": i} for i in range(3)]
+    # The operators of the original Datasets aren't modified.
+    assert limited._plan._logical_plan.dag.output_dependencies[0]._limit == 3
+
+    ds = ray.data.range(10).limit(5).limit(3)
+    ds = ds.union(ray.data.range(2), ray.data.range(20).limit(8).limit(4))
+    assert Counter(extract_values("id", ds.take_all())) == Counter(
+        [0, 1, 2] + [0, 1] + [0, 1, 2, 3]
+    )
+
+
+def test_drop_redundant_limit(ray_start_regular_shared_2_cpus):
+    ds = ray.data.range(100)
+    # Fetching the schema caches the metadata of the Read, so its number of rows is
+    # known before execution.
+    ds.schema()
+    ds = ds.limit(100).map(column_udf("id", lambda x: x)).limit(5)
+    optimized_plan = LogicalOptimizer().optimize(ds._plan._logical_plan)
+    assert optimized_plan.dag.dag_str == (
+        "Read[ReadRange] -> MapRows[Map(<lambda>)] -> Limit[limit=5]"
+    )
+    assert extract_values("id", ds.take_all()) == list(range(5))
+
+    # Without cached metadata, the Limit is kept rather than calling the
+    # datasource to get the number of rows.
+    ds = ray.data.range(100).limit(100)
+    optimized_plan = LogicalOptimizer().optimize(ds._plan._logical_plan)
+    assert optimized_plan.dag.dag_str == "Read[ReadRange] -> Limit[limit=100]"
+
+    # The number of rows of a Map isn't known before execution, so the Limit is
+    # kept even though it can't drop any rows.
+    ds = ray.data.range(100).map(column_udf("id", lambda x: x)).limit(200)
+    optimized_plan = LogicalOptimizer().optimize(ds._plan._logical_plan)
+    assert optimized_plan.dag.dag_str == (
+        "Read[ReadRange] -> MapRows[Map(<lambda>)] -> Limit[limit=200]"
+    )
+
+
+def test_drop_redundant_limit_doesnt_call_datasource(ray_start_regular_shared_2_cpus):
+    class CountingDatasource(RangeDatasource):
+        def __init__(self, n: int):
+            super().__init__(n, column_name="id")
+            self.get_read_tasks_parallelisms = []
+
+        def get_read_tasks(self, parallelism: int) -> List[ReadTask]:
+            self.get_read_tasks_parallelisms.append(parallelism)
+            return super().get_read_tasks(parallelism)
+
+    datasource = CountingDatasource(100)
+    ds = ray.data.read_datasource(datasource, override_num_blocks=4)
+    assert extract_values("id", ds.take(5)) == list(range(5))
+    # Optimizing the Limit added by `take()` doesn't call `get_read_tasks`, so all
+    # calls come from planning the read itself.
+    assert datasource.get_read_tasks_parallelisms
+    assert all(p == 4 for p in datasource.get_read_tasks_parallelisms)
+
+
+@_with_single_shuffle_strategy
+def test_sort_limit_pushdown(ray_start_regular_shared_2_cpus, configure_shuffle_method):
+    ds = ray.data.range(100, override_num_blocks=4).sort("id", descending=True)
+    ds = ds.limit(5)
+    optimized_plan = LogicalOptimizer().optimize(ds._plan._logical_plan)
+    assert optimized_plan.dag.dag_str == (
+        "Read[ReadRange] -> Sort[Sort, limit=5] -> Limit[limit=5]"
+    )
+    # The operators of the original Dataset aren't modified.
+    assert ds._plan._logical_plan.dag.input_dependency._limit is None
+
+    assert extract_values("id", ds.take_all()) == list(range(99, 94, -1))
+
+    # A Limit that doesn't directly follow the Sort isn't pushed into it.
+    ds = ray.data.range(100).sort("id").filter(lambda row: row["id"] > 10).limit(5)
+    optimized_plan = LogicalOptimizer().optimize(ds._plan._logical_plan)
+    assert optimized_plan.dag.dag_str == (
+        "Read[ReadRange] -> Sort[Sort] -> Filter[Filter(<lambda>)] -> Limit[limit=5]"
+    )
+    assert extract_values("id", ds.take_all()) == list(range(11, 16))
+
+
+def test_limit_stops_upstream_tasks(ray_start_regular_shared_2_cpus):
+    ds = ray.data.range(100, override_num_blocks=100)
+    ds = ds.map(column_udf("id", lambda x: x)).limit(1)
+    assert extract_values("id", ds.take_all()) == [0]
+    # Once the limit is reached, the upstream operator is completed and stops
+    # submitting tasks, instead of running all 100 of them.
+    [upstream_stats] = ds._plan.stats().parents
+    assert upstream_stats.extra_metrics["num_tasks_submitted"] < 100
+
+
 def test_execute_to_legacy_block_list(
     ray_start_regular_shared_2_cpus,
 ):
     ds = ray.data.range(10)
-    # Stats not initialized until `ds.iter_rows()` is called
+    # Stats not initialized until `ds.iter_batches()` is called
     assert ds._plan._snapshot_stats is None
 
-    for i, row in enumerate(ds.iter_rows()):
-        assert row["id"] == i
+    ids = [
+        batch["id"] for batch in ds.iter_batches(batch_format="numpy", batch_size=None)
+    ]
+    np.testing.assert_array_equal(np.concatenate(ids), np.arange(10))
 
     assert ds._plan._snapshot_stats is not None
     assert "ReadRange" in ds._plan._snapshot_stats.metadata
@@ -1758,53 +1844,47 @@ def check_transform_fns(op, expected_types):
         assert isinstance(transform_fn, expected_types[i]), transform_fn
 
 
-@pytest.mark.skip("Needs zero-copy optimization for read->map_batches.")
+@pytest.mark.parametrize("num_map_batches", [1, 2, 3])
 def test_zero_copy_fusion_eliminate_build_output_blocks(
-    ray_start_regular_shared_2_cpus,
+    ray_start_regular_shared_2_cpus, ctx, planner, num_map_batches
 ):
-    ctx = DataContext.get_current()
-
     # Test the EliminateBuildOutputBlocks optimization rule.
-    planner = Planner()
-    read_op = get_parquet_read_logical_op()
-    op = MapBatches(read_op, lambda x: x)
+    read_op = ray.data.range(100)._plan._logical_plan.dag
+    op = read_op
+    for _ in range(num_map_batches):
+        op = MapBatches(op, lambda x: x)
     logical_plan = LogicalPlan(op, ctx)
     physical_plan = planner.plan(logical_plan)
 
-    # Before optimization, there should be a map op and and read op.
+    # Before optimization, there should be a read op and a map op per MapBatches.
     # And they should have the following transform_fns.
-    map_op = physical_plan.dag
-    check_transform_fns(
-        map_op,
-        [
-            BlocksToBatchesMapTransformFn,
-            BatchMapTransformFn,
-            BuildOutputBlocksMapTransformFn,
-        ],
-    )
-    read_op = map_op.input_dependencies[0]
+    map_batches_fns = [
+        BlocksToBatchesMapTransformFn,
+        BatchMapTransformFn,
+        BuildOutputBlocksMapTransformFn,
+    ]
+    physical_op = physical_plan.dag
+    for _ in range(num_map_batches):
+        check_transform_fns(physical_op, map_batches_fns)
+        physical_op = physical_op.input_dependencies[0]
     check_transform_fns(
-        read_op,
+        physical_op,
         [
             BlockMapTransformFn,
             BuildOutputBlocksMapTransformFn,
         ],
     )
 
-    physical_plan = PhysicalOptimizer().optimize(physical_plan)
-    fused_op = physical_plan.dag
+    fused_op = _PHYSICAL_OPTIMIZER.optimize(physical_plan).dag
 
     # After optimization, read and map ops should be fused as one op.
-    # And the BuidlOutputBlocksMapTransformFn in the middle should be dropped.
+    # And the BuildOutputBlocksMapTransformFn after the read should be dropped.
+    # The ones after each MapBatches are kept, because batches need to be
+    # converted to blocks.
     check_transform_fns(
-        fused_op,
-        [
-            BlockMapTransformFn,
-            BlocksToBatchesMapTransformFn,
-            BatchMapTransformFn,
-            BuildOutputBlocksMapTransformFn,
-        ],
+        fused_op, [BlockMapTransformFn] + map_batches_fns * num_map_batches
     )
+    assert isinstance(fused_op.input_dependencies[0], InputDataBuffer)
 
 
 @pytest.mark.parametrize(
@@ -1826,7 +1906,7 @@ def test_configure_map_task_memory_rule(
     data_context,
     expected_memory,
 ):
-    input_op = InputDataBuffer(MagicMock(), [])
+    input_op = InputDataBuffer(data_context, [])
     map_op = MapOperator.create(
         MagicMock(),
         input_op=input_op,
@@ -1834,10 +1914,8 @@ def test_configure_map_task_memory_rule(
         ray_remote_args=ray_remote_args,
         ray_remote_args_fn=ray_remote_args_fn,
     )
-    map_op._metrics = MagicMock(
-        spec=OpRuntimeMetrics, average_bytes_per_output=average_bytes_per_output
-    )
-    plan = PhysicalPlan(map_op, op_map=MagicMock(), context=data_context)
+    map_op._metrics = SimpleNamespace(average_bytes_per_output=average_bytes_per_output)
+    plan = PhysicalPlan(map_op, op_map={}, context=data_context)
     rule = ConfigureMapTaskMemoryUsingOutputSize()
 
     new_plan = rule.apply(plan)
@@ -180,8 +180,8 @@ def test_from_tf(ray_start_regular_shared):
 
 
 @pytest.mark.parametrize("local_read", [True, False])
-def test_from_torch(shutdown_only, local_read, tmp_path):
-    torch_dataset = torchvision.datasets.FashionMNIST(tmp_path, download=True)
+def test_from_torch(shutdown_only, local_read, fashion_mnist_root):
+    torch_dataset = torchvision.datasets.FashionMNIST(fashion_mnist_root)
     expected_data = list(torch_dataset)
 
     ray_dataset = ray.data.from_torch(torch_dataset, local_read=local_read)
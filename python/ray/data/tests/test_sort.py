@@ -1,6 +1,7 @@
 import logging
 import random
 from collections import defaultdict
+from unittest.mock import patch
 
 import numpy as np
 import pandas as pd
@@ -353,6 +354,32 @@ def test_sort_with_one_block(shutdown_only, configure_shuffle_method):
     ).sum("token_counts")
 
 
+@pytest.mark.parametrize("descending", [False, True])
+@pytest.mark.parametrize("batch_format", ["pyarrow", "pandas"])
+def test_sort_task_spec_map_with_limit(descending, batch_format):
+    ids = list(range(20))
+    random.shuffle(ids)
+    block = pa.table({"id": ids})
+    if batch_format == "pandas":
+        block = block.to_pandas()
+    sort_key = SortKey("id", descending=descending)
+    boundaries = [(15,)] if descending else [(5,)]
+
+    # The exec stats of the output metadata record the node ID, which needs Ray to
+    # be initialized, so patch the runtime context instead of starting a cluster.
+    with patch("ray.runtime_context.get_runtime_context"):
+        *partitions, meta = SortTaskSpec.map(
+            0, block, len(boundaries) + 1, boundaries, sort_key, limit=8
+        )
+
+    # Only the first 8 rows in sort order are shuffled, but the metadata still
+    # describes the whole input block.
+    expected = sorted(ids, reverse=descending)[:8]
+    output = pd.concat(BlockAccessor.for_block(p).to_pandas() for p in partitions)
+    assert output["id"].tolist() == expected
+    assert meta.num_rows == 20
+
+
 def test_push_based_shuffle_schedule():
     def _test(num_input_blocks, merge_factor, num_cpus_per_node_map):
         num_cpus = sum(v for v in num_cpus_per_node_map.values())